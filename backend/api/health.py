@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.services.popular_pantries import WARMUP_STATUS
+
+router = APIRouter()
+
+@router.get("/ready")
+def ready():
+    """Server is ready to serve; warm-up keeps running in the background."""
+    return {"ready": True, "warmup": WARMUP_STATUS}
\ No newline at end of file
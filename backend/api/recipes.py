@@ -1,11 +1,14 @@
+import json
 from typing import List, Literal
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.db import SessionLocal
 from app.models import Recipe, RecipeIngredient
 from app.services import recipe_llm_client
+from app.services.recipe_docs import build_recipe_doc, dump_recipe_doc
 
 router = APIRouter()
 
@@ -26,7 +29,7 @@ class UserProfile(BaseModel):
     weight_kg: float
     goal: Literal["lose", "maintain", "gain"]
 
-def get_recipe(recipe_id: int, db: Session):
+def _build_recipe_json(recipe_id: int, db: Session) -> str:
     recipe = (
         db.query(Recipe)
         .filter(Recipe.id == recipe_id)
@@ -35,39 +38,41 @@ def get_recipe(recipe_id: int, db: Session):
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
 
-    # get ingredients for this recipe
     ingredients = (
         db.query(RecipeIngredient)
         .filter(RecipeIngredient.recipe_id == recipe_id)
         .all()
     )
+    return dump_recipe_doc(build_recipe_doc(recipe, ingredients))
 
-    return {
-        "id": recipe.id,
-        "title": recipe.title,
-        "minutes": recipe.minutes,
-        "calories": recipe.calories,
-        "fat_g": recipe.fat_g,
-        "sugar_g": recipe.sugar_g,
-        "sodium_mg": recipe.sodium_mg,
-        "protein_g": recipe.protein_g,
-        "sat_fat_g": recipe.sat_fat_g,
-        "carbs_g": recipe.carbs_g,
-        "n_steps": recipe.n_steps,
-        "steps": recipe.steps.split("\n") if recipe.steps else [],
-        "ingredients": [
-            {
-                "raw": ing.ingredient_raw,
-                "norm": ing.ingredient_norm,
-            }
-            for ing in ingredients
-        ],
-    }
+def get_recipe_json(recipe_id: int, db: Session) -> str:
+    """Recipe detail as a JSON string, straight from the precomputed doc column."""
+    try:
+        row = (
+            db.query(Recipe.doc)
+            .filter(Recipe.id == recipe_id)
+            .first()
+        )
+    except OperationalError:
+        # no doc column yet (ETL not re-run since it was added)
+        db.rollback()
+        return _build_recipe_json(recipe_id, db)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    if row.doc:
+        return row.doc
+
+    return _build_recipe_json(recipe_id, db)
+
+def get_recipe(recipe_id: int, db: Session):
+    return json.loads(get_recipe_json(recipe_id, db))
 
 @router.get("/recipes/{recipe_id}")
 async def get_recipe_basic(recipe_id: int, db: Session = Depends(get_db)):
     """Get basic recipe details without personalized measurements"""
-    return get_recipe(recipe_id, db)
+    return Response(content=get_recipe_json(recipe_id, db), media_type="application/json")
 
 # POST endpoint for recipe with personalized measurements
 @router.post("/recipes/{recipe_id}/user_measurements")
@@ -1,10 +1,12 @@
-from typing import List
+import json
+from typing import List, Literal
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.db import SessionLocal
-from app.services.recommender import recommend_recipes
+from app.services.recommender import recommend_recipes, iter_recommendations
 
 router = APIRouter()
 
@@ -17,8 +19,8 @@ def get_db():
 
 class RecommendRequest(BaseModel):
     ingredients: List[str]
-    max_missing: int = 3
-    limit: int = 20
+    max_missing: int = Field(3, ge=0)
+    limit: int = Field(20, ge=1)
 
 @router.post("/recommend")
 def recommend(req: RecommendRequest, db: Session = Depends(get_db)):
@@ -29,3 +31,25 @@ def recommend(req: RecommendRequest, db: Session = Depends(get_db)):
         limit=req.limit,
     )
     return {"results": recs}
+
+def _stream_results(req: RecommendRequest, fmt: str):
+    # the session lives as long as the stream, not the request handler
+    with SessionLocal() as db:
+        for rec in iter_recommendations(
+            db=db,
+            ingredients=req.ingredients,
+            max_missing=req.max_missing,
+            limit=req.limit,
+        ):
+            if fmt == "sse":
+                yield f"data: {json.dumps(rec)}\n\n"
+            else:
+                yield json.dumps(rec) + "\n"
+
+    if fmt == "sse":
+        yield "event: done\ndata: {}\n\n"
+
+@router.post("/recommend/stream")
+def recommend_stream(req: RecommendRequest, format: Literal["ndjson", "sse"] = "ndjson"):
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(_stream_results(req, format), media_type=media_type)
@@ -1,17 +1,118 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.vision_client import detect_ingredients_from_image
+import asyncio
+from typing import List, Literal
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import BATCH_MAX_IMAGES, BATCH_CONCURRENCY
+from app.db import SessionLocal
+from app.services.vision_client import detect_ingredients_from_image, detect_labels_from_image
+from app.services.image_preprocess import read_upload_limited, preprocess_image
+from app.services.ingredients_cleaner import aggregate
+from app.services.recommender import recommend_recipes
 
 router = APIRouter()
 
+ALLOWED_TYPES = {"image/jpeg", "image/png"}
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 @router.post("/recognize")
 async def recognize(file: UploadFile = File(...)):
-    if file.content_type not in {"image/jpeg", "image/png"}:
+    if file.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    image_bytes = await file.read()
+    raw_bytes = await read_upload_limited(file)
+    image = await preprocess_image(raw_bytes)
+    print(
+        f"[Vision] {image.original_size} -> {len(image.data)} bytes "
+        f"(saved {image.bytes_saved})"
+    )
+
     try:
-        ingredients = await detect_ingredients_from_image(image_bytes)
+        ingredients = await detect_ingredients_from_image(
+            image.data,
+            mime_type=image.mime_type,
+            cache_key=image.content_hash,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gemini error: {e}")
 
-    return {"ingredients": ingredients}
\ No newline at end of file
+    return {"ingredients": ingredients, "bytes_saved": image.bytes_saved}
+
+@router.post("/recognize/batch")
+async def recognize_batch(
+    files: List[UploadFile] = File(...),
+    combine: Literal["max", "noisy_or"] = Form("max"),
+    recommend: bool = Form(False),
+    max_missing: int = Form(3, ge=0),
+    limit: int = Form(20, ge=1),
+    db: Session = Depends(get_db),
+):
+    """
+    Recognize several photos (fridge, freezer, pantry...) in one request and
+    return a single deduplicated ingredient list, optionally with recipes.
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    if len(files) > BATCH_MAX_IMAGES:
+        raise HTTPException(status_code=400, detail=f"Too many files (max {BATCH_MAX_IMAGES})")
+    for file in files:
+        if file.content_type not in ALLOWED_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.filename}")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def process(file: UploadFile):
+        async with semaphore:
+            raw_bytes = await read_upload_limited(file)
+            image = await preprocess_image(raw_bytes)
+            try:
+                labels = await detect_labels_from_image(
+                    image.data,
+                    mime_type=image.mime_type,
+                    cache_key=image.content_hash,
+                )
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Gemini error: {e}")
+            return image, labels
+
+    # cancel the remaining images (and their Gemini calls) as soon as one
+    # of them fails; gather re-raises that first error
+    tasks = [asyncio.create_task(process(f)) for f in files]
+    try:
+        processed = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    # tag every label with its photo so aggregate can combine across photos
+    names_with_conf = [
+        (name, conf, idx)
+        for idx, (_, labels) in enumerate(processed)
+        for name, conf in labels
+    ]
+    ingredients = aggregate(names_with_conf, combine=combine)
+
+    bytes_saved = sum(image.bytes_saved for image, _ in processed)
+    print(f"[Vision] batch of {len(files)} images (saved {bytes_saved} bytes)")
+
+    response = {"ingredients": ingredients, "bytes_saved": bytes_saved}
+
+    if recommend:
+        response["results"] = await run_in_threadpool(
+            recommend_recipes,
+            db=db,
+            ingredients=[i["name"] for i in ingredients],
+            max_missing=max_missing,
+            limit=limit,
+        )
+
+    return response
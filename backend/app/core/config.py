@@ -7,3 +7,19 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 if GEMINI_API_KEY is None:
     raise RuntimeError("GEMINI_API_KEY is not set")
+
+# Image preprocessing (vision uploads)
+IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_BYTES", str(15 * 1024 * 1024)))
+IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", "1024"))
+IMAGE_OUTPUT_FORMAT = os.getenv("IMAGE_OUTPUT_FORMAT", "JPEG").upper()  # JPEG or WEBP
+
+if IMAGE_OUTPUT_FORMAT not in {"JPEG", "WEBP"}:
+    raise RuntimeError(f"Unsupported IMAGE_OUTPUT_FORMAT: {IMAGE_OUTPUT_FORMAT}")
+
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+# allowance for multipart boundaries/headers on top of the image bytes
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+# Batch recognition
+BATCH_MAX_IMAGES = int(os.getenv("BATCH_MAX_IMAGES", "8"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "3"))
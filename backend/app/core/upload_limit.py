@@ -0,0 +1,78 @@
+# app/core/upload_limit.py
+import json
+
+from fastapi import HTTPException
+
+
+class BodyTooLarge(HTTPException):
+    # an HTTPException so FastAPI's body parsing re-raises it as a 413
+    # instead of wrapping it into a generic 400
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"Upload too large (max {max_bytes} bytes)")
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies over a per-path byte limit before the multipart
+    parser spools them to disk: up front from Content-Length, and by
+    counting chunks for bodies sent without one.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                too_large = int(content_length) > max_bytes
+            except ValueError:
+                await _send_error(send, 400, "Invalid Content-Length")
+                return
+            if too_large:
+                await _send_error(send, 413, f"Upload too large (max {max_bytes} bytes)")
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise BodyTooLarge(max_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLarge as e:
+            if response_started:
+                raise
+            await _send_error(send, e.status_code, e.detail)
+
+
+async def _send_error(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -1,5 +1,5 @@
 from sqlalchemy import (Column, Integer, BigInteger, Float, Text, ForeignKey)
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.db import Base
 
 # SQLAlchemy Models
@@ -23,6 +23,11 @@ class Recipe(Base):
 
     n_ingredients = Column(Integer)
 
+    # precomputed JSON of the full recipe detail (steps, ingredients, nutrition),
+    # written by the ETL so /api/recipes/{id} is a single-row lookup. Deferred
+    # so regular Recipe loads don't pull the blob (or need the column at all).
+    doc = deferred(Column(Text))
+
     ingredients = relationship("RecipeIngredient", back_populates="recipe", cascade="all, delete-orphan")
 
 
@@ -35,4 +40,16 @@ class RecipeIngredient(Base):
     ingredient_raw = Column(Text, nullable=False)
     ingredient_norm = Column(Text, nullable=False)
 
-    recipe = relationship("Recipe", back_populates="ingredients")
\ No newline at end of file
+    recipe = relationship("Recipe", back_populates="ingredients")
+
+
+class PrecomputedRecommendation(Base):
+    __tablename__ = "precomputed_recommendations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # sorted ingredient_norm values joined with "|", see recommender.ingredients_key
+    ingredients_key = Column(Text, nullable=False, unique=True, index=True)
+    support = Column(Integer)  # number of recipes containing the whole set
+    max_missing = Column(Integer, nullable=False)
+    limit = Column(Integer, nullable=False)
+    results = Column(Text, nullable=False)  # JSON list, same rows as /api/recommend
\ No newline at end of file
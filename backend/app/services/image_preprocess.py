@@ -0,0 +1,105 @@
+# app/services/image_preprocess.py
+import hashlib
+import io
+from dataclasses import dataclass
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import (
+    IMAGE_MAX_UPLOAD_BYTES,
+    IMAGE_MAX_DIMENSION,
+    IMAGE_OUTPUT_FORMAT,
+    IMAGE_QUALITY,
+)
+
+READ_CHUNK_SIZE = 64 * 1024
+OUTPUT_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+PASSTHROUGH_MIME_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png"}
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    content_hash: str  # sha256 of the preprocessed bytes, used as the cache key
+    original_size: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.original_size - len(self.data))
+
+async def read_upload_limited(file: UploadFile, max_bytes: int = IMAGE_MAX_UPLOAD_BYTES) -> bytes:
+    """
+    Per-file cap when copying the (already spooled) upload into memory.
+    The request body itself is capped by UploadSizeLimitMiddleware.
+    """
+    buf = bytearray()
+    while True:
+        chunk = await file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        if len(buf) > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Image too large (max {max_bytes} bytes)",
+            )
+    return bytes(buf)
+
+def _reencode(raw: bytes) -> tuple[bytes, str]:
+    """
+    Downscale to IMAGE_MAX_DIMENSION and re-encode. EXIF is dropped because
+    it is never passed to save(); orientation is applied to the pixels first.
+
+    Small images with no EXIF that don't shrink when re-encoded are passed
+    through unchanged. Returns (data, mime_type).
+    """
+    with Image.open(io.BytesIO(raw)) as img:
+        source_format = img.format
+        has_exif = bool(img.getexif())
+        original_size = img.size
+
+        # let JPEG decode straight at reduced scale; no-op for other formats
+        img.draft("RGB", (IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+        resized = img.size != original_size
+
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+
+        out = io.BytesIO()
+        img.save(out, format=IMAGE_OUTPUT_FORMAT, quality=IMAGE_QUALITY, optimize=True)
+        data = out.getvalue()
+
+    if (
+        len(data) >= len(raw)
+        and not resized
+        and not has_exif
+        and source_format in PASSTHROUGH_MIME_TYPES
+    ):
+        return raw, PASSTHROUGH_MIME_TYPES[source_format]
+
+    return data, OUTPUT_MIME_TYPES[IMAGE_OUTPUT_FORMAT]
+
+async def preprocess_image(raw: bytes) -> PreparedImage:
+    # Pillow decode/resize/encode is CPU bound, keep it off the event loop
+    try:
+        data, mime_type = await run_in_threadpool(_reencode, raw)
+    except Image.DecompressionBombError:
+        raise HTTPException(status_code=413, detail="Image dimensions too large")
+    except (UnidentifiedImageError, OSError):
+        raise HTTPException(status_code=400, detail="Could not decode image")
+
+    return PreparedImage(
+        data=data,
+        mime_type=mime_type,
+        content_hash=hashlib.sha256(data).hexdigest(),
+        original_size=len(raw),
+    )
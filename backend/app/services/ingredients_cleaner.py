@@ -41,10 +41,20 @@ def map_to_canonical(name: str, score_cutoff: float = 60.0) -> str | None:
     ) or (None, None, None)
     return match  
 
-def aggregate(names_with_conf: list[tuple[str, float]]) -> list[dict]:
+def aggregate(names_with_conf: list[tuple], combine: str = "max") -> list[dict]:
+    """
+    names_with_conf: (name, conf) or (name, conf, source) tuples. Labels from the
+    same source (e.g. the same photo) are merged with max; across sources the
+    per-source confidences are combined with `combine` ("max" or "noisy_or").
+    """
+    if combine not in {"max", "noisy_or"}:
+        raise ValueError(f"Unknown combine mode: {combine}")
+
     buckets: dict[str, dict] = {}
 
-    for raw_name, conf in names_with_conf:
+    for item in names_with_conf:
+        raw_name, conf = item[0], item[1]
+        source = item[2] if len(item) > 2 else 0
         canon = map_to_canonical(raw_name)
         if not canon:
             continue
@@ -52,21 +62,30 @@ def aggregate(names_with_conf: list[tuple[str, float]]) -> list[dict]:
         if canon not in buckets:
             buckets[canon] = { #updated gemini output structure
                 "name": canon,
-                "max_conf": conf,
+                "source_conf": {source: conf},
                 "raw_labels": [raw_name],
             }
         else:
             b = buckets[canon]
-            b["max_conf"] = max(b["max_conf"], conf)
+            b["source_conf"][source] = max(b["source_conf"].get(source, 0.0), conf)
             b["raw_labels"].append(raw_name)
 
     results = []
     for item in buckets.values():
-        if item["max_conf"] < 0.3: #ignore low confidence ingredients
+        confs = item["source_conf"].values()
+        if combine == "noisy_or":
+            miss = 1.0
+            for c in confs:
+                miss *= 1.0 - min(max(c, 0.0), 1.0)
+            conf = 1.0 - miss
+        else:
+            conf = max(confs)
+
+        if conf < 0.3: #ignore low confidence ingredients
             continue
         results.append({
             "name": item["name"],
-            "confidence": float(item["max_conf"]),
+            "confidence": float(conf),
             "raw_labels": item["raw_labels"],
         })
 
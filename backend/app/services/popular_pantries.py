@@ -0,0 +1,129 @@
+# app/services/popular_pantries.py
+import json
+import threading
+from collections import Counter
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import PrecomputedRecommendation, RecipeIngredient
+from app.services.recommender import (
+    CACHE_MAX_LIMIT,
+    cache_results,
+    ingredients_key,
+    iter_recommendations,
+)
+
+# progress of the startup warm-up, reported by /api/ready
+WARMUP_STATUS: Dict = {"state": "pending", "loaded": 0, "total": 0, "error": None}
+# set on shutdown to stop an in-progress warm-up
+WARMUP_STOP = threading.Event()
+
+def mine_frequent_itemsets(
+    db: Session,
+    top_n: int = 30,
+    max_size: int = 3,
+    max_sets: int = 300,
+) -> List[Tuple[Tuple[str, ...], int]]:
+    """
+    Count ingredient combinations (size 1..max_size) drawn from the top_n most
+    used ingredients, and return the max_sets most frequent with their support.
+    """
+    top = [
+        row[0]
+        for row in db.execute(
+            select(RecipeIngredient.ingredient_norm)
+            .group_by(RecipeIngredient.ingredient_norm)
+            .order_by(func.count(RecipeIngredient.id).desc())
+            .limit(top_n)
+        )
+    ]
+    if not top:
+        return []
+
+    rows = db.execute(
+        select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_norm)
+        .filter(RecipeIngredient.ingredient_norm.in_(top))
+        .order_by(RecipeIngredient.recipe_id)
+    )
+
+    counts: Counter = Counter()
+
+    def count_recipe(items: set) -> None:
+        ordered = sorted(items)
+        for size in range(1, min(max_size, len(ordered)) + 1):
+            counts.update(combinations(ordered, size))
+
+    current_id = None
+    current: set = set()
+    for recipe_id, norm in rows:
+        if recipe_id != current_id:
+            if current:
+                count_recipe(current)
+            current_id = recipe_id
+            current = set()
+        current.add(norm)
+    if current:
+        count_recipe(current)
+
+    return counts.most_common(max_sets)
+
+def precompute_popular_pantries(
+    db: Session,
+    max_missing: int = 3,
+    limit: int = CACHE_MAX_LIMIT,
+    **mine_kwargs,
+) -> int:
+    """
+    Rebuild the precomputed_recommendations table from the frequent itemsets.
+    Returns the number of rows written.
+    """
+    itemsets = mine_frequent_itemsets(db, **mine_kwargs)
+
+    db.query(PrecomputedRecommendation).delete()
+    for items, support in itemsets:
+        results = list(iter_recommendations(db, list(items), max_missing, limit))
+        db.add(
+            PrecomputedRecommendation(
+                ingredients_key=ingredients_key(list(items)),
+                support=support,
+                max_missing=max_missing,
+                limit=limit,
+                results=json.dumps(results),
+            )
+        )
+    db.commit()
+    return len(itemsets)
+
+def warm_recommendation_cache(db: Session) -> None:
+    """Load every precomputed result set into the recommender cache."""
+    WARMUP_STATUS.update(state="running", loaded=0, total=0, error=None)
+    try:
+        WARMUP_STATUS["total"] = db.query(PrecomputedRecommendation).count()
+        # least popular first, so the most popular sets are the most recently
+        # used entries and survive eviction if the table outgrows the cache
+        q = (
+            db.query(PrecomputedRecommendation)
+            .order_by(PrecomputedRecommendation.support.asc())
+            .yield_per(100)
+        )
+        for row in q:
+            if WARMUP_STOP.is_set():
+                WARMUP_STATUS["state"] = "cancelled"
+                return
+            cache_results(
+                row.ingredients_key.split("|"),
+                row.max_missing,
+                row.limit,
+                json.loads(row.results),
+            )
+            WARMUP_STATUS["loaded"] += 1
+    except Exception as e:
+        # full message (SQL text etc.) goes to the log only, /api/ready is public
+        print(f"[Startup] Warm-up failed: {e}")
+        WARMUP_STATUS.update(state="failed", error=type(e).__name__)
+        return
+
+    WARMUP_STATUS["state"] = "done"
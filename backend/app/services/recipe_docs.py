@@ -0,0 +1,32 @@
+# app/services/recipe_docs.py
+import json
+from typing import List
+
+from app.models import Recipe, RecipeIngredient
+
+def build_recipe_doc(recipe: Recipe, ingredients: List[RecipeIngredient]) -> dict:
+    """Full recipe detail as served by /api/recipes/{id}."""
+    return {
+        "id": recipe.id,
+        "title": recipe.title,
+        "minutes": recipe.minutes,
+        "calories": recipe.calories,
+        "fat_g": recipe.fat_g,
+        "sugar_g": recipe.sugar_g,
+        "sodium_mg": recipe.sodium_mg,
+        "protein_g": recipe.protein_g,
+        "sat_fat_g": recipe.sat_fat_g,
+        "carbs_g": recipe.carbs_g,
+        "n_steps": recipe.n_steps,
+        "steps": recipe.steps.split("\n") if recipe.steps else [],
+        "ingredients": [
+            {
+                "raw": ing.ingredient_raw,
+                "norm": ing.ingredient_norm,
+            }
+            for ing in ingredients
+        ],
+    }
+
+def dump_recipe_doc(doc: dict) -> str:
+    return json.dumps(doc, separators=(",", ":"))
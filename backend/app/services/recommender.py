@@ -1,22 +1,70 @@
-from typing import List, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Iterator, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.models import Recipe, RecipeIngredient
 
-def recommend_recipes(
+STREAM_BATCH_SIZE = 200
+
+# in-process cache of recommend_recipes results, warmed at startup from
+# the precomputed_recommendations table. Only small result sets are cached
+# (limit <= CACHE_MAX_LIMIT, also the precompute limit) so the cache holds at
+# most RESULT_CACHE_SIZE * CACHE_MAX_LIMIT rows; entries expire after
+# RESULT_CACHE_TTL_SECONDS so a re-run ETL is picked up without a restart.
+RESULT_CACHE_SIZE = 1024
+CACHE_MAX_LIMIT = 20
+RESULT_CACHE_TTL_SECONDS = 3600
+_RESULT_CACHE: "OrderedDict[Tuple[str, int, int], Tuple[float, List[Dict]]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()  # sync endpoints and the warm-up run in worker threads
+
+def ingredients_key(ingredients: List[str]) -> str:
+    return "|".join(sorted(set(ingredients)))
+
+def cache_results(ingredients: List[str], max_missing: int, limit: int, results: List[Dict]) -> None:
+    if limit > CACHE_MAX_LIMIT:
+        return
+
+    key = (ingredients_key(ingredients), max_missing, limit)
+    expires_at = time.monotonic() + RESULT_CACHE_TTL_SECONDS
+    with _CACHE_LOCK:
+        _RESULT_CACHE[key] = (expires_at, [dict(r) for r in results])
+        _RESULT_CACHE.move_to_end(key)
+        if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+def _cached_results(key: Tuple[str, int, int]) -> List[Dict] | None:
+    with _CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, results = entry
+        if expires_at < time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+    # copies, so callers can't mutate the shared cached rows
+    return [dict(r) for r in results]
+
+def iter_recommendations(
     db: Session,
     ingredients: List[str],
     max_missing: int = 3,
     limit: int = 20,
-) -> List[Dict]:
+) -> Iterator[Dict]:
     """
+    Yield ranked recommendations best first. Filtering, scoring and ordering
+    happen in SQL, so rows are streamed off the cursor and memory stays
+    bounded regardless of limit.
+
     max_missing: how many ingredients a recipe is allowed to be missing
     """
 
     if not ingredients:
-        return []
-    
+        return
+
     # subquery: count how many of the given ingredients each recipe uses
     matches_subq = (
         db.query(
@@ -28,39 +76,55 @@ def recommend_recipes(
         .subquery()
     )
 
+    match_count = matches_subq.c.match_count
+    missing = Recipe.n_ingredients - match_count
+    #score matches: more matches, fewer missing
+    score = match_count - 0.1 * missing
+
     q = (
         db.query(
-            Recipe,
-            matches_subq.c.match_count,
+            Recipe.id,
+            Recipe.title,
+            Recipe.minutes,
+            Recipe.calories,
+            match_count,
+            missing.label("missing_count"),
+            score.label("score"),
         )
         .join(matches_subq, Recipe.id == matches_subq.c.recipe_id)
+        .filter(Recipe.n_ingredients.isnot(None))
+        .filter(missing <= max_missing)
+        # sort: best first & cut to limit
+        .order_by(score.desc(), Recipe.id)
+        .limit(limit)
+        .yield_per(STREAM_BATCH_SIZE)
     )
 
-    results = []
-    for recipe, match_count in q:
-        if recipe.n_ingredients is None:
-            continue
-
-        missing = recipe.n_ingredients - match_count
-
-        if missing > max_missing:
-            continue
-
-        #score matches: more matches, fewer missing
-        score = float(match_count) - 0.1 * float(missing)
-
-        results.append(
-            {
-                "id": recipe.id,
-                "title": recipe.title,
-                "minutes": recipe.minutes,
-                "calories": recipe.calories,
-                "match_count": int(match_count),
-                "missing_count": int(missing),
-                "score": score,
-            }
-        )
+    for row in q:
+        yield {
+            "id": row.id,
+            "title": row.title,
+            "minutes": row.minutes,
+            "calories": row.calories,
+            "match_count": int(row.match_count),
+            "missing_count": int(row.missing_count),
+            "score": float(row.score),
+        }
+
+def recommend_recipes(
+    db: Session,
+    ingredients: List[str],
+    max_missing: int = 3,
+    limit: int = 20,
+) -> List[Dict]:
+    """
+    max_missing: how many ingredients a recipe is allowed to be missing
+    """
+    key = (ingredients_key(ingredients), max_missing, limit)
+    cached = _cached_results(key)
+    if cached is not None:
+        return cached
 
-    # sort: best first & cut to limit
-    results.sort(key=lambda r: r["score"], reverse=True)
-    return results[:limit]
+    results = list(iter_recommendations(db, ingredients, max_missing, limit))
+    cache_results(ingredients, max_missing, limit, results)
+    return results
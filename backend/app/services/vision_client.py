@@ -1,4 +1,5 @@
 import json
+from collections import OrderedDict
 import google.generativeai as genai
 from app.core.config import GEMINI_API_KEY  
 from app.services.ingredients_cleaner import aggregate
@@ -7,6 +8,10 @@ genai.configure(api_key=GEMINI_API_KEY)
 MODEL_NAME = "gemini-2.5-flash"
 model = genai.GenerativeModel(MODEL_NAME)
 
+# parsed (name, confidence) labels keyed by the sha256 of the preprocessed image bytes
+RESULT_CACHE_SIZE = 256
+_RESULT_CACHE: "OrderedDict[str, list[tuple[str, float]]]" = OrderedDict()
+
 def _parse_ingredient_list(text: str) -> list[tuple[str, float]]:
     text = text.strip()
     names_with_conf: list[tuple[str, float]] = []
@@ -66,7 +71,16 @@ def _parse_ingredient_list(text: str) -> list[tuple[str, float]]:
 
     return names_with_conf
 
-async def detect_ingredients_from_image(image_bytes: bytes) -> list[str]:
+async def detect_labels_from_image(
+    image_bytes: bytes,
+    mime_type: str = "image/jpeg",
+    cache_key: str | None = None,
+) -> list[tuple[str, float]]:
+    """Raw (name, confidence) labels from Gemini, before canonical aggregation."""
+    if cache_key is not None and cache_key in _RESULT_CACHE:
+        _RESULT_CACHE.move_to_end(cache_key)
+        return _RESULT_CACHE[cache_key]
+
     prompt = """
     Identify visible food ingredients in this image.
 
@@ -85,14 +99,28 @@ async def detect_ingredients_from_image(image_bytes: bytes) -> list[str]:
     Do NOT include any explanation, markdown, or code fences.
     """
 
-    response = model.generate_content(
+    response = await model.generate_content_async(
         [
             prompt,
-            {"mime_type": "image/jpeg", "data": image_bytes},
+            {"mime_type": mime_type, "data": image_bytes},
         ],
         generation_config={"temperature": 0.2},
     )
 
     text = response.text
     names_with_conf = _parse_ingredient_list(text)
+
+    if cache_key is not None:
+        _RESULT_CACHE[cache_key] = names_with_conf
+        if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+    return names_with_conf
+
+async def detect_ingredients_from_image(
+    image_bytes: bytes,
+    mime_type: str = "image/jpeg",
+    cache_key: str | None = None,
+) -> list[dict]:
+    names_with_conf = await detect_labels_from_image(image_bytes, mime_type, cache_key)
     return aggregate(names_with_conf)
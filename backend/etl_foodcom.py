@@ -7,6 +7,8 @@ from sqlalchemy import (
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 from app.models import Base, Recipe, RecipeIngredient
+from app.services.recipe_docs import build_recipe_doc, dump_recipe_doc
+from app.services.popular_pantries import precompute_popular_pantries
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -77,10 +79,15 @@ def run_etl(csv_path="data/RAW_recipes.csv", chunksize=5000):
                     carbs_g,
                 ) = parse_nutrition(row["nutrition"])
 
+                # match what the Integer column stores (219.0 -> 219, 71.8 stays)
+                # so recipes.doc agrees with the calories served elsewhere
+                if calories is not None and calories.is_integer():
+                    calories = int(calories)
+
                 recipe = Recipe(
                     id=rid,
                     title=row["name"],
-                    minutes=row["minutes"],
+                    minutes=int(row["minutes"]),
                     calories=calories,
                     fat_g=fat_g,
                     sugar_g=sugar_g,
@@ -88,22 +95,26 @@ def run_etl(csv_path="data/RAW_recipes.csv", chunksize=5000):
                     protein_g=protein_g,
                     sat_fat_g=sat_fat_g,
                     carbs_g=carbs_g,
-                    n_steps=row["n_steps"],
+                    n_steps=int(row["n_steps"]),
                     steps=parse_steps(row["steps"]),
-                    n_ingredients=row["n_ingredients"],
+                    n_ingredients=int(row["n_ingredients"]),
                 )
-                recipes.append(recipe)
 
                 # Ingredients
                 ing_list = parse_ingredients(row["ingredients"])
-                for ing in ing_list:
-                    ingredients.append(
-                        RecipeIngredient(
-                            recipe_id=rid,
-                            ingredient_raw=ing,
-                            ingredient_norm=ing.lower(),
-                        )
+                recipe_ings = [
+                    RecipeIngredient(
+                        recipe_id=rid,
+                        ingredient_raw=ing,
+                        ingredient_norm=ing.lower(),
                     )
+                    for ing in ing_list
+                ]
+                ingredients.extend(recipe_ings)
+
+                # pre-structured detail document served by get_recipe
+                recipe.doc = dump_recipe_doc(build_recipe_doc(recipe, recipe_ings))
+                recipes.append(recipe)
 
             session.bulk_save_objects(recipes)
             session.bulk_save_objects(ingredients)
@@ -112,6 +123,10 @@ def run_etl(csv_path="data/RAW_recipes.csv", chunksize=5000):
             total += len(chunk)
             print(f"Loaded {total} recipes...")
 
+        # popular pantries: frequent ingredient sets -> top-k recommendations
+        n_sets = precompute_popular_pantries(session)
+        print(f"Precomputed recommendations for {n_sets} popular ingredient sets")
+
     print("ETL Completed!")
 
 
@@ -1,9 +1,18 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api import vision, debug, recommend, recipes
+from api import vision, debug, recommend, recipes, health
+from app.core.config import IMAGE_MAX_UPLOAD_BYTES, UPLOAD_OVERHEAD_BYTES, BATCH_MAX_IMAGES
+from app.core.upload_limit import UploadSizeLimitMiddleware
 from app.db import SessionLocal
 from app.services.ingredients_cleaner import refresh_canonical_ingredients, get_canonical_ingredients
+from app.services.popular_pantries import warm_recommendation_cache, WARMUP_STATUS, WARMUP_STOP
+
+def _warm_up():
+    with SessionLocal() as db:
+        warm_recommendation_cache(db)
+    print(f"[Startup] Warm-up {WARMUP_STATUS['state']}: {WARMUP_STATUS['loaded']} result sets cached")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -12,13 +21,30 @@ async def lifespan(app: FastAPI):
         refresh_canonical_ingredients(db)
         print(f"[Startup] Loaded {len(get_canonical_ingredients())} canonical ingredients")
 
+    # warm recommendation caches in the background, don't hold up readiness
+    warmup_task = asyncio.create_task(asyncio.to_thread(_warm_up))
+
     yield
 
     # SHUTDOWN
+    if not warmup_task.done():
+        print("[Shutdown] Stopping warm-up...")
+        WARMUP_STOP.set()
+        await warmup_task
     print("[Shutdown] Server stopping...")
 
 app = FastAPI(lifespan=lifespan)
 
+# Cap upload bodies before they are parsed and spooled to disk.
+# Added before CORS so CORS wraps it and its 413s still carry CORS headers.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/recognize": IMAGE_MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES,
+        "/api/recognize/batch": (IMAGE_MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES) * BATCH_MAX_IMAGES,
+    },
+)
+
 # CORS Configuration - Allow frontend to connect
 app.add_middleware(
     CORSMiddleware,
@@ -42,7 +68,15 @@ app.include_router(vision.router, prefix="/api")
 #       "confidence": 0.8,
 #       "raw_labels": ["apple"]
 #     }
-#   ]
+#   ],
+#   "bytes_saved": 2841203
+# }
+# POST /api/recognize/batch - Upload several images (multipart "files")
+# Form fields: combine ("max" | "noisy_or"), recommend (bool), max_missing, limit
+# Returns: {
+#   "ingredients": [...],            # merged across all photos
+#   "bytes_saved": 8123456,
+#   "results": [...]                 # only when recommend=true, same as /api/recommend
 # }
 
 app.include_router(debug.router, prefix="/api")
@@ -69,6 +103,16 @@ app.include_router(recommend.router, prefix="/api")
 #     ...
 #   ]
 # }
+# POST /api/recommend/stream?format=ndjson|sse - Same request body as /api/recommend
+# Streams ranked results one per line (NDJSON) or one per "data:" event (SSE),
+# best first, so large limits don't have to be buffered.
+
+app.include_router(health.router, prefix="/api")
+# GET /api/ready - Readiness + background cache warm-up progress
+# Returns: {
+#   "ready": true,
+#   "warmup": {"state": "running", "loaded": 120, "total": 300, "error": null}
+# }
 
 app.include_router(recipes.router, prefix="/api")
 # GET /api/recipes/{recipe_id} - Get full recipe details by ID